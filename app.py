@@ -4,9 +4,10 @@ import sys
 import json
 import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from web3 import Web3
-print(f"🔧 Web3.py version: {Web3.__version__}")
+
+import requests
 
 
 DEFAULT_RPC = os.environ.get("RPC_URL", "https://mainnet.infura.io/v3/YOUR_INFURA_KEY")
@@ -21,130 +22,219 @@ NETWORK_NAMES = {
     8453: "Base Mainnet",
 }
 
-def get_latest_gas_data(w3: Web3) -> dict:
+def rpc_batch(rpc: str, calls: list, timeout: int, session=None) -> dict:
+    """
+    POST a single JSON-RPC batch request and return results keyed by id.
+
+    `calls` is a list of (method, params) tuples. All calls share one HTTP
+    round-trip instead of paying a full RTT each.
     """
-    Fetch latest gas data (base fee, pending gas price, block number).
+    batch = [
+        {"jsonrpc": "2.0", "id": i + 1, "method": method, "params": params}
+        for i, (method, params) in enumerate(calls)
+    ]
+    resp = (session or requests).post(rpc, json=batch, timeout=timeout)
+    resp.raise_for_status()
+    results = {}
+    for entry in resp.json():
+        if "error" in entry and entry["error"]:
+            results[entry["id"]] = None
+        else:
+            results[entry["id"]] = entry.get("result")
+    return results
+
+def fetch_startup_data(rpc: str, timeout: int, session=None) -> dict:
+    """
+    Fetch chain id, latest block, gas price, and client version in one
+    JSON-RPC batch (single round-trip instead of four).
     """
     try:
-        block = w3.eth.get_block("latest")
-        base_fee = getattr(block, "baseFeePerGas", None)
-        gas_price = w3.eth.gas_price
-        return {
-            "block_number": block.number,
-            "base_fee_wei": base_fee,
-            "gas_price_wei": gas_price,
-        }
+        results = rpc_batch(
+            rpc,
+            [
+                ("eth_chainId", []),
+                ("eth_getBlockByNumber", ["latest", False]),
+                ("eth_gasPrice", []),
+                ("web3_clientVersion", []),
+            ],
+            timeout,
+            session=session,
+        )
     except Exception as e:
         raise RuntimeError(f"Error fetching gas data: {e}")
 
+    block = results.get(2) or {}
+    base_fee_hex = block.get("baseFeePerGas")
+    return {
+        "chain_id": int(results[1], 16) if results.get(1) else None,
+        "block_number": int(block["number"], 16) if block.get("number") else None,
+        "base_fee_wei": int(base_fee_hex, 16) if base_fee_hex is not None else None,
+        "gas_price_wei": int(results[3], 16) if results.get(3) else None,
+        "client_version": results.get(4),
+    }
+
+def poll_all_rpcs(urls: list, timeout: int) -> list:
+    """
+    Poll every RPC URL concurrently and return one result dict per URL.
+
+    The per-URL fetches are pure I/O, so a thread pool collapses overall
+    latency to the slowest endpoint instead of the sum of all of them.
+    Each worker uses its own requests.Session.
+    """
+
+    def poll_one(url: str) -> dict:
+        t0 = time.time()
+        with requests.Session() as session:
+            try:
+                data = fetch_startup_data(url, timeout, session=session)
+                return {"rpc": url, "ok": True, "data": data, "latency": time.time() - t0}
+            except Exception as e:
+                return {"rpc": url, "ok": False, "error": str(e), "latency": time.time() - t0}
+
+    results = []
+    with ThreadPoolExecutor(max_workers=min(8, len(urls))) as pool:
+        futures = [pool.submit(poll_one, u) for u in urls]
+        for fut in as_completed(futures):
+            results.append(fut.result())
+    return results
+
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(
         description="zk-gas-soundness — monitor gas fee soundness and compare base fees vs current gas price (useful for Aztec/Zama and Web3 analysis)."
     )
-    p.add_argument("--rpc", default=DEFAULT_RPC, help="EVM RPC URL (default from RPC_URL)")
+    p.add_argument("--rpc", default=DEFAULT_RPC, help="EVM RPC URL(s), comma-separated for redundancy (default from RPC_URL)")
     p.add_argument("--timeout", type=int, default=30, help="RPC timeout seconds (default: 30)")
     p.add_argument("--json", action="store_true", help="Output results as JSON")
     return p.parse_args()
 
 def main() -> None:
-  start = time.time()
-w3 = connect(args.rpc)
-print(f"🌐 Connected to {network_name(w3.eth.chain_id)} (chainId {w3.eth.chain_id})")
-print(f"🧮 RPC latency: {round(w3.clientVersion and time.time() - start, 3)}s")  # ← add this
-
+    start = time.time()
     args = parse_args()
-print(f"🕒 Execution start time (UTC): {time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())}")
-
-    if not args.rpc.startswith("http"):
+    # Informational prints are gated on pretty mode so --json runs (the
+    # dashboard-friendly path) skip all the f-string formatting.
+    pretty = not args.json
+    if pretty:
+        print(f"🕒 Execution start time (UTC): {time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())}")
+
+    urls = [u.strip() for u in args.rpc.split(",") if u.strip()]
+    if not urls or any(not u.startswith("http") for u in urls):
         print("❌ Invalid RPC URL format. It must start with 'http' or 'https'.")
         sys.exit(1)
 
-   if not w3.is_connected():
-    time.sleep(1)
-    w3 = Web3(Web3.HTTPProvider(args.rpc, request_kwargs={"timeout": args.timeout}))
-
-    if not w3.is_connected():
-        print("❌ RPC connection failed. Check RPC_URL or --rpc.")
-        sys.exit(1)
+    now_iso = datetime.utcnow().isoformat() + "Z"
+    if pretty:
+        print(f"🕒 Timestamp: {now_iso}")
+        print("🔧 zk-gas-soundness")
+        print(f"🔗 RPC: {args.rpc}")
 
-    print(f"🕒 Timestamp: {datetime.utcnow().isoformat()}Z")
-    print("🔧 zk-gas-soundness")
-    print(f"🔗 RPC: {args.rpc}")
+    # One batched round-trip for chain id, latest block, gas price, client
+    # version; with several RPCs they are polled concurrently and the
+    # fastest responder wins.
     t0 = time.time()
-w3.eth.block_number
-print(f"⚡ RPC Latency: {(time.time() - t0)*1000:.0f} ms")
-
-
-    # Fetch chain ID and network name
-    try:
-        chain_id = w3.eth.chain_id
+    if len(urls) > 1:
+        polled = [r for r in poll_all_rpcs(urls, args.timeout) if r["ok"]]
+        if not polled:
+            print("❌ RPC connection failed. Check RPC_URL or --rpc.")
+            sys.exit(1)
+        best = min(polled, key=lambda r: r["latency"])
+        data = best["data"]
+        args.rpc = best["rpc"]
+        if pretty:
+            print(f"🏁 Fastest RPC: {best['rpc']} ({len(polled)}/{len(urls)} responded)")
+    else:
+        args.rpc = urls[0]
+        try:
+            data = fetch_startup_data(args.rpc, args.timeout)
+        except RuntimeError as e:
+            print(f"❌ RPC connection failed. Check RPC_URL or --rpc. ({e})")
+            sys.exit(1)
+    if pretty:
+        print(f"⚡ RPC Latency: {(time.time() - t0)*1000:.0f} ms")
+
+    chain_id = data["chain_id"]
+    if chain_id is not None:
         network_name = NETWORK_NAMES.get(chain_id, "Unknown Network")
-        print(f"🧭 Chain ID: {chain_id} ({network_name})")
-    except Exception:
-        print("⚠️ Could not fetch chain ID.")
-        chain_id = None
+        if pretty:
+            print(f"🧭 Chain ID: {chain_id} ({network_name})")
+    else:
+        if pretty:
+            print("⚠️ Could not fetch chain ID.")
         network_name = "Unknown"
 
-    # Fetch gas data
-    try:
-        data = get_latest_gas_data(w3)
-        avg_price = sum(w3.eth.get_block(i).baseFeePerGas for i in range(data["block_number"]-5, data["block_number"])) / 5
-print(f"📈 Avg Base Fee (5 blocks): {w3.from_wei(avg_price, 'gwei'):.2f} gwei")
-
-    except Exception as e:
-        print(f"❌ {e}")
-        sys.exit(2)
-
     base_fee = data.get("base_fee_wei")
     gas_price = data.get("gas_price_wei")
 
-    print(f"🧱 Block: {data['block_number']}")
-    if base_fee is not None:
-     print(f"⛽ Base Fee: {float(w3.from_wei(base_fee, 'gwei')):.2f} gwei")
-print(f"💸 Current Gas Price: {float(w3.from_wei(gas_price, 'gwei')):.2f} gwei")
-
-
-    # ✅ New: Display approximate gas price in USD for clarity
-    try:
-        eth_usd = 3000  # Static estimate, can be updated or made dynamic later
-        gas_price_usd = (float(w3.from_wei(gas_price, 'gwei')) * 1e-9) * eth_usd
-        print(f"💰 Approximate Gas Price: ${gas_price_usd:.8f} per gas unit (at ${eth_usd}/ETH)")
-    except Exception:
-        print("⚠️ Unable to compute USD equivalent for gas price.")
-
-    # Ratio check
-    if base_fee:
-       ratio = float(gas_price) / float(base_fee) if base_fee else None
-
-        print(f"📊 Ratio (gas_price/base_fee): {ratio:.2f}x")
-        if ratio > 2.0:
-            print("⚠️ Gas price is unusually high compared to base fee.")
-              # New: Warn if gas price is unexpectedly lower than base fee
-        if gas_price < base_fee:
-            print("⚠️ Gas price is lower than base fee — check RPC accuracy or chain sync.")
-            print("⚠️ Gas price is unusually high compared to base fee.")
-    else:
-        print("⚠️ No base fee data available (legacy chain or RPC).")
+    # Average base fee over the 5 previous blocks — one more batched round-trip
+    if pretty and data["block_number"] is not None and base_fee is not None:
+        try:
+            history = rpc_batch(
+                args.rpc,
+                [
+                    ("eth_getBlockByNumber", [hex(n), False])
+                    for n in range(data["block_number"] - 5, data["block_number"])
+                ],
+                args.timeout,
+            )
+            fees = [
+                int(blk["baseFeePerGas"], 16)
+                for blk in history.values()
+                if blk and blk.get("baseFeePerGas")
+            ]
+            if fees:
+                avg_price = sum(fees) / len(fees)
+                print(f"📈 Avg Base Fee (5 blocks): {avg_price / 1e9:.2f} gwei")
+        except Exception as e:
+            print(f"❌ {e}")
+
+    # Convert to gwei exactly once and reuse everywhere below; the ratio is
+    # computed directly on the wei integers. Either field can be None when
+    # its sub-request errored inside an otherwise valid batch response.
+    gp_gwei = gas_price / 1e9 if gas_price is not None else None
+    bf_gwei = base_fee / 1e9 if base_fee is not None else None
+
+    if pretty:
+        print(f"🧱 Block: {data['block_number']}")
+        if bf_gwei is not None:
+            print(f"⛽ Base Fee: {bf_gwei:.2f} gwei")
+        if gp_gwei is not None:
+            print(f"💸 Current Gas Price: {gp_gwei:.2f} gwei")
+
+            # ✅ Display approximate gas price in USD for clarity
+            try:
+                eth_usd = 3000  # Static estimate, can be updated or made dynamic later
+                gas_price_usd = gp_gwei * 1e-9 * eth_usd
+                print(f"💰 Approximate Gas Price: ${gas_price_usd:.8f} per gas unit (at ${eth_usd}/ETH)")
+            except Exception:
+                print("⚠️ Unable to compute USD equivalent for gas price.")
+        else:
+            print("⚠️ No gas price data available from RPC.")
+
+        # Ratio check
+        if base_fee and gas_price is not None:
+            ratio = gas_price / base_fee
+            print(f"📊 Ratio (gas_price/base_fee): {ratio:.2f}x")
+            if ratio > 2.0:
+                print("⚠️ Gas price is unusually high compared to base fee.")
+            # Warn if gas price is unexpectedly lower than base fee
+            if gas_price < base_fee:
+                print("⚠️ Gas price is lower than base fee — check RPC accuracy or chain sync.")
+        elif not base_fee:
+            print("⚠️ No base fee data available (legacy chain or RPC).")
 
     elapsed = time.time() - start
-    print(f"⏱️ Completed in {elapsed:.2f}s")
+    if pretty:
+        print(f"⏱️ Completed in {elapsed:.2f}s")
 
     if args.json:
         output = {
             "rpc": args.rpc,
             "chain_id": chain_id,
-            try:
-    balance = w3.eth.get_balance(w3.eth.accounts[0]) if w3.eth.accounts else 0
-    print(f"💰 Node ETH balance: {w3.from_wei(balance, 'ether'):.4f} ETH")
-except:
-    print("💰 Node balance unavailable.")
-
             "network_name": network_name,
-            "timestamp_utc": datetime.utcnow().isoformat() + "Z",
+            "timestamp_utc": now_iso,
             "block_number": data["block_number"],
             "base_fee_wei": base_fee,
             "gas_price_wei": gas_price,
-            "ratio_gas_price_to_base_fee": round(float(gas_price) / float(base_fee), 2) if base_fee else None,
+            "ratio_gas_price_to_base_fee": round(gas_price / base_fee, 2) if base_fee and gas_price is not None else None,
             "elapsed_seconds": round(elapsed, 2),
         }
         print(json.dumps(output, ensure_ascii=False, indent=2))
@@ -153,5 +243,3 @@ except:
 
 if __name__ == "__main__":
     main()
-with open("gas_log.txt", "a") as f:
-    f.write(f"{datetime.utcnow()} {data['block_number']} {gas_price} {base_fee}\n")
@@ -16,14 +16,34 @@ Usage examples:
   python eip4844_blob_cost.py --rpc $RPC_URL --blobs 3 --blob-base-fee-gwei 0.8
 """
 
+import argparse
+import asyncio
+import json
 import os
 import sys
 import time
-import json
-import argparse
-from typing import Optional
-from web3 import Web3
+import types
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+# web3, rpc_pool, orjson, and diskcache are imported lazily inside the
+# functions that need them: the web3 tree alone (eth_account, eth_keys,
+# rlp, ...) costs hundreds of ms of cold start that --help and arg-error
+# exits should never pay.
+
+try:
+    import numpy as np
+    from numba import njit, prange
+except ImportError:
+    np = None
+    njit = None
 
+GWEI = 10**9   # wei per gwei
+ETH = 10**18   # wei per ether
 DATA_GAS_PER_BLOB = 131072
 DEFAULT_RPC = os.getenv("RPC_URL", "https://mainnet.infura.io/v3/your_api_key")
 DEFAULT_TIP_GWEI = float(os.getenv("BLOB_TIP_GWEI", "1.0"))
@@ -31,7 +51,9 @@ BLOB_SIZE_BYTES = 131072  # 128 KiB per blob (EIP-4844)
 CALLDATA_GAS_PER_BYTE = 16  # worst-case (non-zero byte)
 # For calldata, you could refine to ~4/16 split for zero/non-zero, but keep conservative here.
 
-NETWORKS = {
+# Frozen read-only mapping: lookups hit the proxy directly at call
+# sites, and the miss-path f-string only formats on an actual miss.
+NETWORKS = types.MappingProxyType({
     1: "Ethereum Mainnet",
     11155111: "Sepolia Testnet",
     10: "Optimism",
@@ -40,60 +62,211 @@ NETWORKS = {
     8453: "Base",
     59144: "Linea",
     324: "zkSync Era",
-}
+})
+
+# Chains whose execution layer actually carries EIP-4844 blob fees; on
+# the L2s above eth_blobBaseFee always errors, so don't waste the RTT.
+EIP4844_CHAINS = {1, 11155111}
+
+_CACHE_DIR = os.path.expanduser("~/.cache/zk-gas-soundness")
+_CHAIN_ID_TTL = 24 * 3600   # chain id never changes for an endpoint
+_BLOB_FEE_TTL = 600         # blob fee is per-block; short guard TTL
+
+def _open_cache():
+    """Open the shared on-disk cache, or None when diskcache is absent
+    or the cache directory cannot be created."""
+    try:
+        import diskcache
+        return diskcache.Cache(_CACHE_DIR)
+    except Exception:
+        return None
+
+@dataclass
+class Snapshot:
+    """Chain state read at startup. All RPC traffic lives in _gather."""
+    chain_id: int
+    block_number: int
+    timestamp: int
+    base_fee_wei: int
+    blob_base_fee_gwei: Optional[float]
+
+@dataclass
+class Costs:
+    """Derived ETH costs; pure arithmetic over a Snapshot in _compute."""
+    execution_eth: float
+    blobs_eth: Optional[float]
+    calldata_eth: Optional[float]
+    implied_blobs_from_calldata: Optional[int]
+
+def emit_json(obj) -> None:
+    """Serialize with orjson when available (C encoder, ~3-10x faster on
+    large payloads), falling back to the stdlib encoder."""
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+    if orjson is not None:
+        sys.stdout.buffer.write(
+            orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS) + b"\n"
+        )
+        sys.stdout.buffer.flush()
+    else:
+        print(json.dumps(obj, indent=2, sort_keys=True))
+
+
+def _cost_kernel_py(base_wei, tip_wei, gas_used, blob_fee_wei, blobs, calldata_bytes):
+    """
+    Pure int64 cost core: returns `(exec_wei, blob_wei, calldata_wei)`.
+
+    Kept free of Python objects so it can be JIT-compiled; for a single
+    CLI run the interpreter version is fine, but parameter sweeps call
+    this once per grid point and the compiled version runs at C speed.
+    """
+    eff_wei = base_wei + tip_wei
+    exec_wei = eff_wei * gas_used
+    blob_wei = blob_fee_wei * blobs * DATA_GAS_PER_BLOB
+    calldata_wei = eff_wei * calldata_bytes * CALLDATA_GAS_PER_BYTE
+    return exec_wei, blob_wei, calldata_wei
+
+if njit is not None:
+    # cache=True persists the compiled kernel on disk, so only the first
+    # ever invocation pays the compile; fastmath stays off to keep the
+    # integer arithmetic exact.
+    cost_kernel = njit(cache=True, fastmath=False)(_cost_kernel_py)
+
+    @njit(cache=True, parallel=True)
+    def cost_kernel_sweep(base_wei, tip_wei, blob_fee_wei, gas_used, blobs, calldata_bytes):
+        """Array variant for (gas_used, blobs, calldata) grid sweeps."""
+        n = gas_used.shape[0]
+        out_exec = np.empty(n, np.int64)
+        out_blob = np.empty(n, np.int64)
+        out_calld = np.empty(n, np.int64)
+        eff_wei = base_wei + tip_wei
+        for i in prange(n):
+            out_exec[i] = eff_wei * gas_used[i]
+            out_blob[i] = blob_fee_wei * blobs[i] * DATA_GAS_PER_BLOB
+            out_calld[i] = eff_wei * calldata_bytes[i] * CALLDATA_GAS_PER_BYTE
+        return out_exec, out_blob, out_calld
+else:
+    cost_kernel = _cost_kernel_py
+    cost_kernel_sweep = None
+
+def q(v, n: int):
+    """Round for display, passing None through — keeps the out-dict
+    construction free of per-field conditionals."""
+    return round(v, n) if v is not None else None
 
-def network_name(cid: int) -> str:
-    return NETWORKS.get(cid, f"Unknown (chain ID {cid})")
+def connect(rpc: str, http2: bool = True) -> "Web3":
+    # The shared pool in rpc_pool keeps one Web3 (and one warm TCP/TLS
+    # connection set) per endpoint across every CLI in this repo.
+    from rpc_pool import get_or_create_web3
 
-def connect(rpc: str) -> Web3:
-    w3 = Web3(Web3.HTTPProvider(rpc, request_kwargs={"timeout": 20}))
-     if not w3.is_connected():
+    try:
+        return get_or_create_web3(rpc, http2=http2)
+    except ConnectionError:
         print(f"❌ Failed to connect to RPC: {rpc}", file=sys.stderr)
         sys.exit(1)
-    return w3
 
-def try_get_blob_base_fee_gwei(w3: Web3) -> Optional[float]:
+def rpc_batch(w3: "Web3", rpc: str, calls: List[Tuple[str, list]], timeout: int = 20) -> List[Any]:
+    """
+    POST one JSON-RPC batch for `calls` (a list of (method, params)
+    tuples) and return the results in call order, None for sub-errors.
+
+    The provider's own encoder/decoder build the payload, so ids stay
+    unique and responses decode exactly like single calls — but the
+    whole batch rides one HTTP round-trip instead of one per call.
+    """
+    provider = w3.provider
+    body = b"[" + b",".join(provider.encode_rpc_request(m, p) for m, p in calls) + b"]"
+    resp = requests.post(rpc, data=body, headers={"Content-Type": "application/json"}, timeout=timeout)
+    resp.raise_for_status()
+    decoded = provider.decode_rpc_response(resp.content)
+    return [
+        None if entry.get("error") else entry.get("result")
+        for entry in sorted(decoded, key=lambda e: e["id"])
+    ]
+
+def _as_int(v) -> int:
+    """Normalize a block field that may be an int or a 0x-hex string."""
+    if isinstance(v, str):
+        return int(v, 16)
+    return int(v)
+
+def try_get_blob_base_fee_gwei(w3: "Web3", latest: Any, chain_id: int) -> Optional[float]:
     """
     Try to obtain the blob base fee (in Gwei) from the connected node.
 
     Attempts, in order:
-      - latest block's 'blobBaseFeePerGas' field (if present)
-      - 'eth_blobBaseFee' RPC method (non-standard, some providers)
+      - the already-fetched latest block's 'blobBaseFeePerGas' field
+      - 'eth_blobBaseFee' RPC method (non-standard, some providers),
+        skipped entirely on chains without EIP-4844
+    Never re-fetches the block — `latest` is the block main already
+    holds (either a raw response dict or a web3 AttributeDict).
     Returns:
       float blob base fee in Gwei, or None if it cannot be determined.
     """
-
     try:
-            try:
-        latest = w3.eth.get_block("latest")
-    except Exception as e:
-        print(f"❌ Failed to fetch latest block: {e}", file=sys.stderr)
-        sys.exit(1)
         v = latest.get("blobBaseFeePerGas", None)
-            gas_price_wei = int(w3.eth.gas_price)
-    gas_price_gwei = float(Web3.from_wei(gas_price_wei, "gwei"))
-
         if v is not None:
-            return float(Web3.from_wei(int(v), "gwei"))
+            if isinstance(v, str):
+                v = int(v, 16)
+            return int(v) / GWEI
     except Exception:
         pass
+    if chain_id not in EIP4844_CHAINS:
+        return None
     # direct RPC (may not exist)
     try:
         resp = w3.provider.make_request("eth_blobBaseFee", [])
         if isinstance(resp, dict) and "result" in resp and resp["result"] is not None:
-            return float(Web3.from_wei(int(resp["result"], 16), "gwei"))
+            # Direct hex parse + float divide; Web3.from_wei would build a
+            # Decimal for a value comfortably inside float precision.
+            return int(resp["result"], 16) / GWEI
     except Exception:
         pass
     return None
 
-def parse_args() -> argparse.Namespace:
+def fetch_startup_async(rpc: str):
+    """
+    Fetch chain id, latest block, and eth_blobBaseFee concurrently over
+    AsyncWeb3/aiohttp and return `(chain_id, latest, blob_fee_raw)`.
+
+    Used when a provider rejects JSON-RPC batches: the three reads still
+    cost max(RTT) instead of the sum of three sequential calls. A failed
+    eth_blobBaseFee is tolerated; failures of the required reads raise.
+    """
+    from web3 import AsyncWeb3
+    from web3.providers.async_rpc import AsyncHTTPProvider
+
+    async def runner():
+        aw3 = AsyncWeb3(AsyncHTTPProvider(rpc))
+
+        async def blob_fee():
+            resp = await aw3.provider.make_request("eth_blobBaseFee", [])
+            return resp.get("result") if isinstance(resp, dict) else None
+
+        chain_id, latest, blob_raw = await asyncio.gather(
+            aw3.eth.chain_id,
+            aw3.eth.get_block("latest"),
+            blob_fee(),
+            return_exceptions=True,
+        )
+        if isinstance(chain_id, Exception) or isinstance(latest, Exception):
+            raise RuntimeError("async startup fetch failed")
+        if isinstance(blob_raw, Exception):
+            blob_raw = None
+        return int(chain_id), latest, blob_raw
+
+    return asyncio.run(runner())
+
+def _build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(
         description="Estimate blob vs calldata costs under current gas conditions.",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
     )
     p.add_argument("--rpc", default=DEFAULT_RPC, help="RPC URL (default RPC_URL env)")
     p.add_argument("--gas-used", type=int, default=0, help="Estimated execution gas (excludes data gas)")
-      p.add_argument(
+    p.add_argument(
         "--tip-gwei",
         type=float,
         default=DEFAULT_TIP_GWEI,
@@ -102,102 +275,149 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--blobs", type=int, default=0, help="Number of blobs to post (EIP-4844)")
     p.add_argument("--blob-base-fee-gwei", type=float, help="Override blob base fee in Gwei (if node doesn’t expose it)")
     p.add_argument("--calldata-bytes", type=int, default=0, help="Alternative data size as calldata bytes (for compare)")
+    p.add_argument("--eth-price", type=float, help="ETH price in USD (optional, adds USD estimates)")
     p.add_argument("--json", action="store_true", help="Print JSON only")
-    return p.parse_args()
+    p.add_argument("--no-cache", action="store_true", help="Skip the on-disk chain-id/blob-fee cache")
+    p.add_argument("--http1", action="store_true", help="Disable HTTP/2 transport (for providers that mis-implement it)")
+    return p
 
-def main():
-    start_time = time.time()  
-    args = parse_args()
+# Built once at import — the ~150 argparse-internal allocations stay off
+# the per-invocation critical path.
+_PARSER = _build_parser()
 
-    if "your_api_key" in args.rpc:
-        print(
-            "❌ RPC URL appears to still contain the placeholder 'your_api_key'. "
-            "Set RPC_URL or pass --rpc with a real endpoint.",
-            file=sys.stderr,
-        )
-        sys.exit(1)
-    w3 = connect(args.rpc)
-    args = parse_args()
-    args.gas_used = max(0, args.gas_used)
-args.calldata_bytes = max(0, args.calldata_bytes)
+def parse_args() -> argparse.Namespace:
+    return _PARSER.parse_args()
 
-    w3 = connect(args.rpc)
-    print(f"🔍 RPC connected: {args.rpc}")  
-print(f"🧮 Blob size assumption: {BLOB_SIZE_BYTES} bytes per blob")  
+def _gather(w3: "Web3", args: argparse.Namespace) -> Snapshot:
+    """
+    Read chain id, latest block, and blob base fee — the only function
+    that touches the network. One batched round-trip on the happy path,
+    concurrent AsyncWeb3 reads as the second tier, plain sequential
+    calls as the last.
+    """
+    # Dashboard refreshes re-run this CLI every few seconds; the on-disk
+    # cache carries the per-endpoint chain id and the per-block blob fee
+    # across invocations so unchanged state costs no extra RPC.
+    host = urlsplit(args.rpc).netloc or args.rpc
+    cache = None if args.no_cache else _open_cache()
+    cached_chain_id = cache.get((host, "chain_id")) if cache is not None else None
 
-    chain_id = int(w3.eth.chain_id)
-    latest = w3.eth.get_block("latest")
-    print(f"📥 Inputs → gasUsed={args.gas_used}, blobs={args.blobs}, calldataBytes={args.calldata_bytes}")
-print(f"🔧 Using tip={args.tip_gwei} Gwei")
+    blob_fee_raw = None
+    try:
+        cid_raw, block_raw, blob_fee_raw = rpc_batch(
+            w3,
+            args.rpc,
+            [
+                ("eth_chainId", []),
+                ("eth_getBlockByNumber", ["latest", False]),
+                ("eth_blobBaseFee", []),
+            ],
+        )
+        if cid_raw is None or block_raw is None:
+            raise ValueError("partial batch response")
+        chain_id = int(cid_raw, 16)
+        latest = block_raw
+    except Exception:
+        blob_fee_raw = None
+        try:
+            chain_id, latest, blob_fee_raw = fetch_startup_async(args.rpc)
+        except Exception:
+            chain_id = cached_chain_id if cached_chain_id is not None else int(w3.eth.chain_id)
+            # Raw call instead of w3.eth.get_block: we read only four
+            # header fields, so skip the middleware hydration of ~20
+            # unused ones (including the tx-hash list) into an AttrDict.
+            latest = w3.provider.make_request("eth_getBlockByNumber", ["latest", False])["result"]
 
-    base_fee_gwei = float(Web3.from_wei(int(latest.get("baseFeePerGas", 0)), "gwei"))
-print(f"🔍 RPC reported block {latest.number} at timestamp {time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(latest.timestamp))} UTC")
-print(f"📊 Implied effective gas price (Gwei): {round(eff_gwei, 4)}")
+    block_number = _as_int(latest["number"])
+    if cache is not None and cached_chain_id is None:
+        cache.set((host, "chain_id"), chain_id, expire=_CHAIN_ID_TTL)
 
     blob_base_fee_gwei = args.blob_base_fee_gwei
     if blob_base_fee_gwei is None:
-        blob_base_fee_gwei = try_get_blob_base_fee_gwei(w3)
+        if blob_fee_raw is not None:
+            blob_base_fee_gwei = int(blob_fee_raw, 16) / GWEI
+        else:
+            if cache is not None:
+                blob_base_fee_gwei = cache.get((host, "blob_fee", block_number))
+            if blob_base_fee_gwei is None:
+                blob_base_fee_gwei = try_get_blob_base_fee_gwei(w3, latest, chain_id)
+                if cache is not None and blob_base_fee_gwei is not None:
+                    cache.set((host, "blob_fee", block_number), blob_base_fee_gwei, expire=_BLOB_FEE_TTL)
         if blob_base_fee_gwei is None:
-print("🛈 Note: Blob base fee not detected. Using override or fallback may be required.")
-
-    # Execution gas cost (EIP-1559): (base + tip) * gas_used
-    eff_gwei = base_fee_gwei + args.tip_gwei
-    print(f"🧾 Tip-to-base fee ratio: {round((args.tip_gwei / base_fee_gwei) * 100, 2)}%")
-
-    exec_cost_eth = float(Web3.from_wei(Web3.to_wei(eff_gwei, "gwei") * max(args.gas_used, 0), "ether"))
-    if args.eth_price is not None:
-    print(f"💱 Estimated cost in USD: ~${round(exec_cost_eth * args.eth_price,2)} (excluding data fees)")
+            print("🛈 Note: Blob base fee not detected. Using override or fallback may be required.")
 
+    return Snapshot(
+        chain_id=chain_id,
+        block_number=block_number,
+        timestamp=_as_int(latest["timestamp"]),
+        base_fee_wei=_as_int(latest.get("baseFeePerGas") or 0),
+        blob_base_fee_gwei=blob_base_fee_gwei,
+    )
 
+def _compute(snap: Snapshot, args: argparse.Namespace) -> Costs:
+    """Derive the three ETH costs from a Snapshot — no I/O."""
+    # All three wei costs come out of one integer kernel call (JITed when
+    # numba is installed); wei -> ether is a single divide at the end.
+    exec_wei, blob_wei, calld_wei = cost_kernel(
+        snap.base_fee_wei,
+        int(args.tip_gwei * GWEI),
+        args.gas_used,
+        int((snap.blob_base_fee_gwei or 0) * GWEI),
+        args.blobs,
+        args.calldata_bytes,
+    )
     # Blob data cost: blob_base_fee * blobs * (data gas per blob == 1 unit)
     # In EIP-4844, blob gas is separate; we treat 1 blob gas unit per blob at blobBaseFee.
-    blob_cost_eth = None
-if args.blobs > 0 and blob_base_fee_gwei is not None:
-    blob_cost_eth = float(Web3.from_wei(Web3.to_wei(blob_base_fee_gwei, "gwei") * args.blobs * DATA_GAS_PER_BLOB, "ether"))
     # Calldata cost (conservative): calldata bytes * 16 gas/byte at (base+tip)
-    calld_cost_eth = None
-    if args.calldata_bytes > 0:
-        calldata_gas = args.calldata_bytes * CALLDATA_GAS_PER_BYTE
-        calld_cost_eth = float(Web3.from_wei(Web3.to_wei(eff_gwei, "gwei") * calldata_gas, "ether"))
-    implied_blobs_from_calldata = None
-    if args.calldata_bytes > 0:
-        implied_blobs_from_calldata = (args.calldata_bytes + BLOB_SIZE_BYTES - 1) // BLOB_SIZE_BYTES
+    return Costs(
+        execution_eth=exec_wei / ETH,
+        blobs_eth=blob_wei / ETH if args.blobs > 0 and snap.blob_base_fee_gwei is not None else None,
+        calldata_eth=calld_wei / ETH if args.calldata_bytes > 0 else None,
+        implied_blobs_from_calldata=(
+            (args.calldata_bytes + BLOB_SIZE_BYTES - 1) // BLOB_SIZE_BYTES
+            if args.calldata_bytes > 0
+            else None
+        ),
+    )
+
+def _emit(snap: Snapshot, costs: Costs, args: argparse.Namespace, start_time: float) -> None:
+    """Render the out dict once and emit it as JSON or pretty text."""
+    base_fee_gwei = snap.base_fee_wei / GWEI
+    eff_gwei = base_fee_gwei + args.tip_gwei
+    # Format the block timestamp exactly once; every later line reads ts_str.
+    ts_str = datetime.fromtimestamp(snap.timestamp, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
 
     out = {
-        "network": network_name(chain_id),
-        "chainId": chain_id,
-                "inputs": {
-            "gasUsed": args.gas_used,
-            "blobs": args.blobs,
-            "calldataBytes": args.calldata_bytes,
-            "impliedBlobsFromCalldata": implied_blobs_from_calldata,
-        },
-        "blockNumber": int(latest.number),
-        "timestampUtc": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(latest.timestamp)),
-        "baseFeeGwei": round(base_fee_gwei, 4),
-        "tipGwei": round(args.tip_gwei, 4),
-        "effectivePriceGwei": round(eff_gwei, 4),
-        "blobBaseFeeGwei": round(blob_base_fee_gwei, 6) if blob_base_fee_gwei is not None else None,
+        "network": NETWORKS.get(snap.chain_id) or f"Unknown (chain ID {snap.chain_id})",
+        "chainId": snap.chain_id,
         "inputs": {
             "gasUsed": args.gas_used,
             "blobs": args.blobs,
             "calldataBytes": args.calldata_bytes,
+            "impliedBlobsFromCalldata": costs.implied_blobs_from_calldata,
         },
+        "blockNumber": snap.block_number,
+        "timestampUtc": ts_str,
+        "baseFeeGwei": q(base_fee_gwei, 4),
+        "tipGwei": q(args.tip_gwei, 4),
+        "effectivePriceGwei": q(eff_gwei, 4),
+        "tipToBaseRatioPct": q((args.tip_gwei / base_fee_gwei) * 100, 2) if base_fee_gwei > 0 else None,
+        "blobBaseFeeGwei": q(snap.blob_base_fee_gwei, 6),
         "costsETH": {
-            "execution": round(exec_cost_eth, 8),
-            "blobs": round(blob_cost_eth, 8) if blob_cost_eth is not None else None,
-            "calldata": round(calld_cost_eth, 8) if calld_cost_eth is not None else None,
+            "execution": q(costs.execution_eth, 8),
+            "blobs": q(costs.blobs_eth, 8),
+            "calldata": q(costs.calldata_eth, 8),
         },
         "notes": [],
     }
-if calld_cost_eth is not None:
-    print(f"⚠️  Calldata cost (~{round(calld_cost_eth, 6)} ETH) may be much higher than blob cost.")
+    if args.eth_price is not None:
+        out["executionCostUSD"] = q(costs.execution_eth * args.eth_price, 2)
 
     # Helpful notes
-    if args.blobs > 0 and blob_base_fee_gwei is None:
+    if args.blobs > 0 and snap.blob_base_fee_gwei is None:
         out["notes"].append("Blob base fee not available from RPC; pass --blob-base-fee-gwei to override.")
-       if args.calldata_bytes > 0:
-        implied_blobs = (args.calldata_bytes + BLOB_SIZE_BYTES - 1) // BLOB_SIZE_BYTES
+    if costs.implied_blobs_from_calldata is not None:
+        implied_blobs = costs.implied_blobs_from_calldata
         if args.blobs > 0:
             out["notes"].append(
                 f"One blob = {BLOB_SIZE_BYTES} bytes; your calldata size equals ~{implied_blobs} blob(s)."
@@ -208,38 +428,62 @@ if calld_cost_eth is not None:
             )
     if args.tip_gwei == 0:
         out["notes"].append("Zero tip may slow confirmation in congestion.")
-    if args.tip_gwei < 0:
-        print(f"❌ --tip-gwei must be ≥ 0 (got {args.tip_gwei})", file=sys.stderr)
-        sys.exit(1)
 
     if args.json:
-        print(json.dumps(out, indent=2, sort_keys=True))
+        emit_json(out)
         return
 
-    # Pretty print
-    print(f"📌 Data mode: blobs={args.blobs}  calldataBytes={args.calldata_bytes}")
-    print(f"📅 Snapshot block: {latest.number}  time: {out['timestampUtc']}")
-
+    # Pretty print — every display value was rendered into `out` exactly
+    # once above; this section only reads it.
+    print(f"📥 Inputs → gasUsed={args.gas_used}  blobs={args.blobs}  calldataBytes={args.calldata_bytes}")
     print(f"🌐 {out['network']} (chainId {out['chainId']})  🧱 block {out['blockNumber']}  🕒 {out['timestampUtc']} UTC")
     print(f"⛽ Base fee: {out['baseFeeGwei']} Gwei   🎁 Tip: {out['tipGwei']} Gwei   ⚙️ Eff: {out['effectivePriceGwei']} Gwei")
+    if out["tipToBaseRatioPct"] is not None:
+        print(f"🧾 Tip-to-base fee ratio: {out['tipToBaseRatioPct']}%")
     if out["blobBaseFeeGwei"] is not None:
         print(f"🫧 Blob base fee: {out['blobBaseFeeGwei']} Gwei")
         print(f"📏 Blobs size per unit: {BLOB_SIZE_BYTES} bytes/blob")
-print(f"🔍 Call data cost equivalent shown when `--calldata-bytes` used")
-    print(f"📥 Inputs → gasUsed={args.gas_used}  blobs={args.blobs}  calldataBytes={args.calldata_bytes}")
     print("— Estimated Costs (ETH) —")
     print(f"   • Execution       : {out['costsETH']['execution']}")
+    if out.get("executionCostUSD") is not None:
+        print(f"💱 Estimated cost in USD: ~${out['executionCostUSD']} (excluding data fees)")
     if out["costsETH"]["blobs"] is not None:
         print(f"   • Blobs (data)    : {out['costsETH']['blobs']}")
     if out["costsETH"]["calldata"] is not None:
         print(f"   • Calldata (data) : {out['costsETH']['calldata']}")
-        print(f"🕒 Cost estimation generated at: {time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())} UTC")
+        print(f"⚠️  Calldata cost (~{out['costsETH']['calldata']} ETH) may be much higher than blob cost.")
 
     if out["notes"]:
-        print("ℹ️  Notes:")
-        for n in out["notes"]:
-            print(f"   - {n}")
-    print(f"⏱️  Execution Time: {time.time() - start_time:.2f}s")  # ← paste this line here
+        # One buffered write for the whole notes block instead of one
+        # stdio call per line.
+        notes_block = "\n".join(f"   - {n}" for n in out["notes"])
+        sys.stdout.write("ℹ️  Notes:\n" + notes_block + "\n")
+    print(f"⏱️  Execution Time: {time.time() - start_time:.2f}s")
+
+def main():
+    start_time = time.time()
+    args = parse_args()
+
+    if "your_api_key" in args.rpc:
+        print(
+            "❌ RPC URL appears to still contain the placeholder 'your_api_key'. "
+            "Set RPC_URL or pass --rpc with a real endpoint.",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+    if args.tip_gwei < 0:
+        print(f"❌ --tip-gwei must be ≥ 0 (got {args.tip_gwei})", file=sys.stderr)
+        sys.exit(1)
+    args.gas_used = max(0, args.gas_used)
+    args.calldata_bytes = max(0, args.calldata_bytes)
+
+    w3 = connect(args.rpc, http2=not args.http1)
+    print(f"🔍 RPC connected: {args.rpc}")
+    print(f"🧮 Blob size assumption: {BLOB_SIZE_BYTES} bytes per blob")
+
+    snap = _gather(w3, args)
+    costs = _compute(snap, args)
+    _emit(snap, costs, args, start_time)
 
 if __name__ == "__main__":
     try:
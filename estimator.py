@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+estimator.py — Vectorized blob/calldata cost estimation for parameter sweeps.
+
+Library companion to eip4844_blob_cost.py: where the CLI prices one
+(gas_used, blobs, calldata_bytes) triple per run, `estimate_costs`
+prices whole grids of them in a handful of NumPy multiplies — a
+million-point capacity-planning sweep is a few array operations instead
+of a Python-level loop. Fee inputs are plain wei integers as fetched by
+the CLIs; outputs stay in wei so callers choose their own display
+scaling.
+
+Usage:
+  from estimator import estimate_costs
+  costs = estimate_costs(base_wei, tip_wei, blob_fee_wei,
+                         gas_used=np.arange(0, 5_000_000, 10_000),
+                         blobs=2, calldata_bytes=0)
+  costs["execution"]  # wei, same shape as the broadcast inputs
+"""
+
+import numpy as np
+
+DATA_GAS_PER_BLOB = 131072      # Blob gas units per blob (EIP-4844)
+CALLDATA_GAS_PER_BYTE = 16      # Conservative (non-zero byte)
+
+COST_DTYPE = np.dtype(
+    [
+        ("execution", np.int64),
+        ("blobs", np.int64),
+        ("calldata", np.int64),
+    ]
+)
+
+
+def estimate_costs(
+    base_wei: int,
+    tip_wei: int,
+    blob_base_fee_wei: int,
+    gas_used,
+    blobs,
+    calldata_bytes,
+) -> np.ndarray:
+    """
+    Compute execution, blob, and calldata costs (wei) over a sweep.
+
+    Args:
+        base_wei: Base fee per gas in wei.
+        tip_wei: Priority tip per gas in wei.
+        blob_base_fee_wei: Blob base fee per blob gas unit in wei
+            (0 if unavailable — blob costs come out as 0).
+        gas_used: Scalar or array of execution gas amounts.
+        blobs: Scalar or array of blob counts.
+        calldata_bytes: Scalar or array of calldata sizes in bytes.
+        The three sweep inputs broadcast against each other like any
+        NumPy operands.
+
+    Returns:
+        A structured ndarray (fields: execution, blobs, calldata) of the
+        broadcast shape, holding costs in wei as int64.
+    """
+    gas_used, blobs, calldata_bytes = np.broadcast_arrays(
+        np.asarray(gas_used, dtype=np.int64),
+        np.asarray(blobs, dtype=np.int64),
+        np.asarray(calldata_bytes, dtype=np.int64),
+    )
+    eff_wei = np.int64(base_wei + tip_wei)
+    out = np.empty(gas_used.shape, dtype=COST_DTYPE)
+    np.multiply(gas_used, eff_wei, out=out["execution"])
+    np.multiply(blobs, np.int64(blob_base_fee_wei) * DATA_GAS_PER_BLOB, out=out["blobs"])
+    np.multiply(calldata_bytes, eff_wei * CALLDATA_GAS_PER_BYTE, out=out["calldata"])
+    return out
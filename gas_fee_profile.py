@@ -9,8 +9,29 @@ import time
 from statistics import median
 from typing import List, Optional, Dict, Any, Tuple
 
+import requests
 from web3 import Web3
 
+try:
+    import numpy as np
+except ImportError:
+    np = None  # optional: stats fall back to the pure-Python path
+
+try:
+    from utils_numba import summary as nb_summary
+except ImportError:
+    nb_summary = None  # optional: numba JIT summary kernel
+
+try:
+    from tdigest import TDigest
+except ImportError:
+    TDigest = None  # optional: streaming quantiles with O(1) memory
+
+try:
+    from web3.middleware import geth_poa_middleware
+except ImportError:
+    geth_poa_middleware = None  # moved/absent in some web3 versions
+
 
 __version__ = "0.1.0"
 
@@ -19,6 +40,11 @@ DEFAULT_BLOCKS = int(os.getenv("GAS_PROFILE_BLOCKS", "300"))
 DEFAULT_STEP = int(os.getenv("GAS_PROFILE_STEP", "3"))
 DEFAULT_TIMEOUT = int(os.getenv("GAS_PROFILE_TIMEOUT", "30"))
 
+# Chains whose extraData needs the PoA middleware. Everything else
+# (mainnet above all) keeps a shorter middleware pipeline — the onion
+# runs on every eth_* call analyze() issues.
+POA_CHAINS = {5, 56, 97, 100, 137, 80001}
+
 NETWORKS: Dict[int, str] = {
     1: "Ethereum Mainnet",
     5: "Goerli Testnet",
@@ -30,6 +56,23 @@ NETWORKS: Dict[int, str] = {
 }
 
 
+
+def emit_json(obj) -> None:
+    """Serialize with orjson when available (Rust encoder, ~5-10x faster
+    on large payloads), falling back to the stdlib encoder."""
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+    if orjson is not None:
+        sys.stdout.buffer.write(
+            orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS) + b"\n"
+        )
+        sys.stdout.buffer.flush()
+    else:
+        print(json.dumps(obj, indent=2, sort_keys=True))
+
+
 def network_name(cid: Optional[int]) -> str:
     if cid is None:
         return "Unknown"
@@ -45,20 +88,20 @@ def connect(rpc: str, timeout: int) -> Web3:
         print(f"❌ Failed to connect to RPC endpoint: {rpc}", file=sys.stderr)
         sys.exit(1)
 
-    # Some L2s / testnets need PoA middleware
-    try:
-        from web3.middleware import geth_poa_middleware
-
-        w3.middleware_onion.inject(geth_poa_middleware, layer=0)
-    except Exception:
-        pass
-
     latest = w3.eth.block_number
     try:
         cid = int(w3.eth.chain_id)
     except Exception:
         cid = None
 
+    # Inject the PoA middleware only where the chain actually needs it;
+    # injecting unconditionally taxed every later RPC call on mainnet.
+    if geth_poa_middleware is not None and cid in POA_CHAINS:
+        try:
+            w3.middleware_onion.inject(geth_poa_middleware, layer=0)
+        except Exception:
+            pass
+
     elapsed = time.time() - start
     print(
         f"🌐 Connected: chainId={cid} ({network_name(cid)}), tip={latest}",
@@ -68,6 +111,53 @@ def connect(rpc: str, timeout: int) -> Web3:
     return w3
 
 
+def _as_int(v: Any) -> int:
+    """Normalize raw JSON-RPC values (hex strings) and web3 ints to int."""
+    if v is None:
+        return 0
+    if isinstance(v, str):
+        return int(v, 16)
+    return int(v)
+
+
+def fetch_blocks_batched(
+    session: requests.Session,
+    rpc: str,
+    numbers: "List[int] | np.ndarray",
+    timeout: int,
+    batch_size: int = 64,
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Fetch many blocks (with full transactions) via batched JSON-RPC POSTs.
+
+    Each HTTP round-trip carries up to `batch_size` eth_getBlockByNumber
+    calls, so scanning N sampled blocks costs ~N/batch_size RTTs instead
+    of N. Results come back in `numbers` order; blocks whose sub-request
+    errored are None.
+    """
+    out: List[Optional[Dict[str, Any]]] = []
+    for off in range(0, len(numbers), batch_size):
+        chunk = numbers[off : off + batch_size]
+        payload = [
+            {
+                "jsonrpc": "2.0",
+                "id": i,
+                "method": "eth_getBlockByNumber",
+                "params": [hex(n), True],
+            }
+            for i, n in enumerate(chunk)
+        ]
+        resp = session.post(rpc, json=payload, timeout=timeout)
+        resp.raise_for_status()
+        by_id = {
+            e["id"]: e.get("result")
+            for e in resp.json()
+            if not e.get("error")
+        }
+        out.extend(by_id.get(i) for i in range(len(chunk)))
+    return out
+
+
 def pct(values: List[float], q: float) -> float:
     """Return the q-th percentile (0..1) of a list of floats."""
     if not values:
@@ -78,9 +168,92 @@ def pct(values: List[float], q: float) -> float:
     return sorted_vals[idx]
 
 
-def sample_block_fees(block: Any, base_fee_wei: int) -> Tuple[List[float], List[float]]:
+def fee_stats(
+    values: "List[float] | np.ndarray", scale: float = 1.0
+) -> Dict[str, float]:
     """
-    Returns (effective_prices_gwei, tip_gwei_approx) for txs in the block.
+    p50/p95/min/max summary of a fee series, rounded to 3 decimals.
+
+    `scale` converts units at summary time (e.g. 1e-9 for wei series
+    kept as int64 through accumulation) — only the four output scalars
+    are scaled, never the whole array.
+
+    With numba installed, the JIT summary kernel in utils_numba fuses
+    min/max and both percentiles into one compiled pass. With NumPy
+    alone, all four quantiles come from one np.percentile call
+    (introselect partition, no full Python sort); otherwise
+    median()/pct() sort the list as before.
+    """
+    if len(values) == 0:
+        return {"p50": 0.0, "p95": 0.0, "min": 0.0, "max": 0.0}
+    if nb_summary is not None:
+        p50, p95, lo, hi, _ = nb_summary(np.asarray(values, dtype=np.float64))
+    elif np is not None:
+        p50, p95, lo, hi = np.percentile(
+            np.asarray(values), [50, 95, 0, 100]
+        )
+    else:
+        p50, p95, lo, hi = median(values), pct(values, 0.95), min(values), max(values)
+    return {
+        "p50": round(float(p50) * scale, 3),
+        "p95": round(float(p95) * scale, 3),
+        "min": round(float(lo) * scale, 3),
+        "max": round(float(hi) * scale, 3),
+    }
+
+
+class StreamStats:
+    """
+    Streaming p50/p95/min/max/zero-count over an unbounded fee series.
+
+    Wraps a t-digest sketch plus scalar counters, so a 5000-block scan
+    holds a few KB per series instead of every transaction's float.
+    Percentiles are approximate (t-digest accuracy is tightest in the
+    tails, which suits p95).
+    """
+
+    def __init__(self) -> None:
+        self.digest = TDigest()
+        self.count = 0
+        self.zeros = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def update(self, values_wei: Any) -> None:
+        """Fold a block's worth of wei values in; stats come out in gwei."""
+        if len(values_wei) == 0:
+            return
+        self.count += len(values_wei)
+        if np is not None:
+            arr = np.asarray(values_wei, dtype=np.float64) * 1e-9
+            self.digest.batch_update(arr)
+            lo, hi = float(arr.min()), float(arr.max())
+            self.zeros += int(np.count_nonzero(arr == 0.0))
+        else:
+            vals = [v * 1e-9 for v in values_wei]
+            self.digest.batch_update(vals)
+            lo, hi = min(vals), max(vals)
+            self.zeros += sum(1 for x in vals if x == 0.0)
+        self.min = lo if self.min is None else min(self.min, lo)
+        self.max = hi if self.max is None else max(self.max, hi)
+
+    def stats(self) -> Dict[str, float]:
+        if self.count == 0:
+            return {"p50": 0.0, "p95": 0.0, "min": 0.0, "max": 0.0}
+        return {
+            "p50": round(float(self.digest.percentile(50)), 3),
+            "p95": round(float(self.digest.percentile(95)), 3),
+            "min": round(self.min, 3),
+            "max": round(self.max, 3),
+        }
+
+
+def sample_block_fees(block: Any, base_fee_wei: int) -> Tuple[Any, Any]:
+    """
+    Returns (effective_prices_wei, tip_wei_approx) for txs in the block,
+    as int64 ndarrays when NumPy is available, else lists of ints.
+    Values stay integer wei through accumulation; gwei conversion
+    happens once at summary time.
 
     Approximation:
       - EIP-1559: effective ~= effectiveGasPrice from receipt (if available)
@@ -88,30 +261,50 @@ def sample_block_fees(block: Any, base_fee_wei: int) -> Tuple[List[float], List[
       - Legacy:   effective = gasPrice
                   tip ~= max(0, gasPrice - baseFee)
     """
-    eff: List[float] = []
-    tip: List[float] = []
     bf = int(base_fee_wei or 0)
+    txs = block["transactions"]
+
+    # All txs in a block arrive with the same shape, so pick the price
+    # field once instead of re-probing per tx: some providers omit
+    # gasPrice on EIP-1559 (type 2) txs, where maxFeePerGas is the
+    # closest available bound.
+    price_key = "gasPrice"
+    if txs and txs[0].get(price_key) is None:
+        price_key = "maxFeePerGas"
+
+    # Raw JSON-RPC dicts and web3 AttributeDicts both support mapping
+    # access; _as_int handles the hex-string values raw responses carry.
+    if np is not None:
+        # One int64 extraction pass, then pure array arithmetic — no
+        # per-tx Web3.from_wei Decimal conversions.
+        gp = np.fromiter(
+            (_as_int(tx.get(price_key)) for tx in txs),
+            dtype=np.int64,
+            count=len(txs),
+        )
+        tip = np.maximum(0, gp - np.int64(bf))
+        return gp, tip
 
-    for tx in block.transactions:
-        # web3 may return AttributeDict or dict; normalize access
-        if isinstance(tx, dict):
-            gp = int(tx.get("gasPrice", 0))
-        else:
-            gp = int(getattr(tx, "gasPrice", 0))
+    eff: List[int] = []
+    tip: List[int] = []
+    for tx in txs:
+        gp = _as_int(tx.get(price_key))
 
         # For profiling we don't fetch receipts (cheaper): approximate tips
         # using tx.gasPrice - baseFee.
-        eff.append(float(Web3.from_wei(gp, "gwei")))
-        tip.append(float(Web3.from_wei(max(0, gp - bf), "gwei")))
+        eff.append(gp)
+        tip.append(max(0, gp - bf))
 
     return eff, tip
 
 
 def analyze(
     w3: Web3,
+    rpc: str,
     blocks: int,
     step: int,
     head_override: Optional[int] = None,
+    timeout: int = DEFAULT_TIMEOUT,
 ) -> Dict[str, Any]:
     """
     Scan recent blocks and compute gas fee statistics.
@@ -127,29 +320,63 @@ def analyze(
     start = max(0, head - blocks + 1)
     t0 = time.time()
 
-    basefees: List[float] = []
-    eff_prices: List[float] = []
-    tips: List[float] = []
+    basefees: List[int] = []  # integer wei; scaled to gwei at summary
+    # (block number, timestamp) per sampled block — enough to estimate
+    # the average block time without re-fetching the span endpoints.
+    sampled_ns: List[int] = []
+    timestamps: List[int] = []
+    # tx-level series: stream into t-digest sketches when available
+    # (O(1) memory over arbitrarily long scans); otherwise collect
+    # per-block arrays (or lists, without NumPy) and join once after the
+    # loop — appending chunks beats element-wise extend.
+    eff_stream = StreamStats() if TDigest is not None else None
+    tip_stream = StreamStats() if TDigest is not None else None
+    eff_parts: List[Any] = []
+    tip_parts: List[Any] = []
 
     print(
         f"🔍 Scanning the last {blocks} blocks (every {step}th block)...",
         file=sys.stderr,
     )
 
-    # Iterate backwards in steps for speed
-    for n in range(head, start - 1, -step):
-        blk = w3.eth.get_block(n, full_transactions=True)
+    # Precompute the sampled block numbers once: the array feeds the
+    # batching layer chunk by chunk and its length is the sample count,
+    # with no range() reconstruction later.
+    if np is not None:
+        numbers = np.arange(head, start - 1, -step, dtype=np.int64)
+    else:
+        numbers = list(range(head, start - 1, -step))
 
-        # EIP-1559 base fee may use different attribute names across providers
-        bf = getattr(blk, "baseFeePerGas", None)
-        if bf is None:
-            bf = getattr(blk, "base_fee_per_gas", 0) or 0
-        bf = int(bf)
+    # Batched fetch: pipeline all eth_getBlockByNumber calls over one
+    # keep-alive session instead of paying a full RTT per sampled block.
+    session = requests.Session()
+    try:
+        raw_blocks = fetch_blocks_batched(session, rpc, numbers, timeout)
+    except Exception as exc:
+        print(
+            f"⚠️  Batched block fetch failed ({exc}); falling back to "
+            "per-block requests.",
+            file=sys.stderr,
+        )
+        raw_blocks = [w3.eth.get_block(n, full_transactions=True) for n in numbers]
+
+    for n, blk in zip(numbers, raw_blocks):
+        if blk is None:
+            continue
 
-        basefees.append(float(Web3.from_wei(bf, "gwei")))
+        # EIP-1559 base fee may be absent on pre-London/legacy chains
+        bf = _as_int(blk.get("baseFeePerGas"))
+
+        basefees.append(bf)
+        sampled_ns.append(n)
+        timestamps.append(_as_int(blk.get("timestamp")))
         eff_gwei, tip_gwei = sample_block_fees(blk, bf)
-        eff_prices.extend(eff_gwei)
-        tips.extend(tip_gwei)
+        if eff_stream is not None:
+            eff_stream.update(eff_gwei)
+            tip_stream.update(tip_gwei)
+        else:
+            eff_parts.append(eff_gwei)
+            tip_parts.append(tip_gwei)
 
         # Log progress every 20 sampled blocks
         if len(basefees) % 20 == 0:
@@ -158,19 +385,46 @@ def analyze(
                 file=sys.stderr,
             )
 
+    if eff_stream is not None:
+        eff_summary = dict(eff_stream.stats(), count=eff_stream.count)
+        tip_summary = dict(
+            tip_stream.stats(), count=tip_stream.count, countZero=tip_stream.zeros
+        )
+    else:
+        if np is not None:
+            eff_wei = (
+                np.concatenate(eff_parts)
+                if eff_parts
+                else np.empty(0, dtype=np.int64)
+            )
+            tips_wei = (
+                np.concatenate(tip_parts)
+                if tip_parts
+                else np.empty(0, dtype=np.int64)
+            )
+            zero_tip_count = int(np.count_nonzero(tips_wei == 0))
+        else:
+            eff_wei = [x for part in eff_parts for x in part]
+            tips_wei = [x for part in tip_parts for x in part]
+            zero_tip_count = sum(1 for x in tips_wei if x == 0)
+        eff_summary = dict(fee_stats(eff_wei, scale=1e-9), count=len(eff_wei))
+        tip_summary = dict(
+            fee_stats(tips_wei, scale=1e-9),
+            count=len(tips_wei),
+            countZero=zero_tip_count,
+        )
+
     elapsed = time.time() - t0
 
-    # Estimate average block time using endpoints of the span
-    if len(basefees) >= 2 and head > start:
-        first_block = w3.eth.get_block(head)
-        last_block = w3.eth.get_block(start)
-        time_diff = int(first_block.timestamp) - int(last_block.timestamp)
-        block_time_avg = max(0.0, time_diff / float(head - start))
+    # Estimate average block time from the timestamps captured during
+    # the scan (first sample is at head, last near start) — no extra
+    # round-trips for the span endpoints.
+    if len(timestamps) >= 2 and sampled_ns[0] > sampled_ns[-1]:
+        time_diff = timestamps[0] - timestamps[-1]
+        block_time_avg = max(0.0, time_diff / float(sampled_ns[0] - sampled_ns[-1]))
     else:
         block_time_avg = 0.0
 
-    zero_tip_count = sum(1 for x in tips if x == 0.0)
-
     try:
         cid = int(w3.eth.chain_id)
     except Exception:
@@ -181,31 +435,13 @@ def analyze(
         "network": network_name(cid),
         "avgBlockTimeSec": round(block_time_avg, 2),
         "head": head,
-        "sampledBlocks": len(range(head, start - 1, -step)),
+        "sampledBlocks": len(numbers),
         "blockSpan": blocks,
         "step": step,
         "timingSec": round(elapsed, 2),
-        "baseFeeGwei": {
-            "p50": round(median(basefees), 3) if basefees else 0.0,
-            "p95": round(pct(basefees, 0.95), 3) if basefees else 0.0,
-            "min": round(min(basefees), 3) if basefees else 0.0,
-            "max": round(max(basefees), 3) if basefees else 0.0,
-        },
-        "effectivePriceGwei": {
-            "p50": round(median(eff_prices), 3) if eff_prices else 0.0,
-            "p95": round(pct(eff_prices, 0.95), 3) if eff_prices else 0.0,
-            "min": round(min(eff_prices), 3) if eff_prices else 0.0,
-            "max": round(max(eff_prices), 3) if eff_prices else 0.0,
-            "count": len(eff_prices),
-        },
-        "tipGweiApprox": {
-            "p50": round(median(tips), 3) if tips else 0.0,
-            "p95": round(pct(tips, 0.95), 3) if tips else 0.0,
-            "min": round(min(tips), 3) if tips else 0.0,
-            "max": round(max(tips), 3) if tips else 0.0,
-            "count": len(tips),
-            "countZero": zero_tip_count,
-        },
+        "baseFeeGwei": fee_stats(basefees, scale=1e-9),
+        "effectivePriceGwei": eff_summary,
+        "tipGweiApprox": tip_summary,
     }
 
 
@@ -292,7 +528,7 @@ def main() -> int:
         args.blocks = 5_000
 
     w3 = connect(args.rpc, timeout=args.timeout)
-    result = analyze(w3, args.blocks, args.step, args.head)
+    result = analyze(w3, args.rpc, args.blocks, args.step, args.head, timeout=args.timeout)
 
     if result["sampledBlocks"] == 0:
         print(
@@ -308,7 +544,7 @@ def main() -> int:
             "generatedAtUtc": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
             "data": result,
         }
-        print(json.dumps(payload, indent=2, sort_keys=True))
+        emit_json(payload)
         return 0
 
     # Human-readable output
@@ -22,6 +22,7 @@ Usage examples:
 """
 
 import argparse
+import asyncio
 import json
 import os
 import sys
@@ -29,11 +30,47 @@ import time
 from typing import Any, Dict, List, Optional
 from urllib.parse import urlparse
 
-from web3 import Web3
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None  # optional: probes fall back to sequential sync mode
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # optional: classification falls back to the scalar ladder
 
 
 DEFAULT_HIGH_RATIO = 2.0   # > 2x base fee → likely overpriced / congested
 DEFAULT_LOW_RATIO = 0.9    # < 0.9x base fee → underpriced vs base fee
+DEFAULT_TIMEOUT = 8        # per-RPC probe timeout in seconds
+
+# Shared keep-alive session for the sync probe path: pool sized for a
+# many-chain monitor so every probe reuses a warm connection.
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+_SESSION.mount("https://", _adapter)
+_SESSION.mount("http://", _adapter)
+
+
+
+def emit_json(obj) -> None:
+    """Serialize with orjson when available (Rust encoder, ~5-10x faster
+    on large payloads), falling back to the stdlib encoder."""
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+    if orjson is not None:
+        sys.stdout.buffer.write(
+            orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS) + b"\n"
+        )
+        sys.stdout.buffer.flush()
+    else:
+        print(json.dumps(obj, indent=2, sort_keys=True))
 
 
 def parse_args() -> argparse.Namespace:
@@ -64,6 +101,13 @@ def parse_args() -> argparse.Namespace:
         ),
     )
 
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help=f"Per-RPC probe timeout in seconds. Default={DEFAULT_TIMEOUT}",
+    )
+
     parser.add_argument(
         "--json",
         action="store_true",
@@ -116,12 +160,60 @@ def resolve_rpcs_and_names(args: argparse.Namespace) -> (List[str], List[str]):
     return rpcs, resolved_names
 
 
+# Classification as small int codes so array-level work stays numeric;
+# STATUS_LABELS maps codes to strings only at output time.
+STATUS_HEALTHY = 0
+STATUS_OVERPRICED = 1
+STATUS_UNDERPRICED = 2
+STATUS_NO_EIP1559 = 3
+STATUS_ERROR = 4
+STATUS_LABELS = ("healthy", "overpriced", "underpriced", "no_eip1559", "error")
+
+
+def classify_ratios(
+    base_fees: "np.ndarray",
+    gas_prices: "np.ndarray",
+    high: float,
+    low: float,
+) -> "np.ndarray":
+    """
+    Vectorized classification of whole fee arrays (int8 status codes).
+
+    Missing values are NaN. One np.select pass classifies 10^5 points in
+    well under a millisecond — the scalar ladder would not scale to
+    historical scans or many-chain sweeps.
+    """
+    base_fees = np.asarray(base_fees, dtype=np.float64)
+    gas_prices = np.asarray(gas_prices, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = gas_prices / np.where(base_fees > 0, base_fees, np.nan)
+        return np.select(
+            [
+                ~(base_fees > 0),          # catches NaN and <= 0
+                np.isnan(gas_prices),
+                ratio > high,
+                ratio < low,
+            ],
+            [STATUS_NO_EIP1559, STATUS_ERROR, STATUS_OVERPRICED, STATUS_UNDERPRICED],
+            default=STATUS_HEALTHY,
+        ).astype(np.int8)
+
+
 def classify_ratio(
     base_fee_gwei: Optional[float],
     gas_price_gwei: Optional[float],
     high: float,
     low: float,
 ) -> str:
+    if np is not None:
+        code = classify_ratios(
+            [base_fee_gwei if base_fee_gwei is not None else np.nan],
+            [gas_price_gwei if gas_price_gwei is not None else np.nan],
+            high,
+            low,
+        )[0]
+        return STATUS_LABELS[code]
+
     if base_fee_gwei is None or base_fee_gwei <= 0:
         return "no_eip1559"
 
@@ -137,15 +229,8 @@ def classify_ratio(
     return "healthy"
 
 
-def probe_rpc(
-    rpc_url: str,
-    high: float,
-    low: float,
-) -> Dict[str, Any]:
-    start = time.time()
-    w3 = Web3(Web3.HTTPProvider(rpc_url, request_kwargs={"timeout": 8}))
-
-    result: Dict[str, Any] = {
+def _blank_result(rpc_url: str) -> Dict[str, Any]:
+    return {
         "rpc": rpc_url,
         "ok": False,
         "error": None,
@@ -158,41 +243,133 @@ def probe_rpc(
         "elapsed_seconds": None,
     }
 
-    try:
-        if not w3.is_connected():
-            result["error"] = "connection_failed"
-            return result
 
-        chain_id = w3.eth.chain_id
-        block = w3.eth.get_block("latest")
+# The three probe calls, batched into one JSON-RPC array so each chain
+# costs a single HTTP round-trip.
+_PROBE_BATCH = [
+    {"jsonrpc": "2.0", "id": 0, "method": "eth_chainId", "params": []},
+    {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "eth_getBlockByNumber",
+        "params": ["latest", False],
+    },
+    {"jsonrpc": "2.0", "id": 2, "method": "eth_gasPrice", "params": []},
+]
 
-        # EIP-1559 base fee may be missing on non-1559 chains
-        base_fee_wei = getattr(block, "baseFeePerGas", None)
-        gas_price_wei = w3.eth.gas_price
 
-        base_fee_gwei = float(base_fee_wei) / 1e9 if base_fee_wei is not None else None
-        gas_price_gwei = float(gas_price_wei) / 1e9 if gas_price_wei is not None else None
+def _apply_probe_entries(
+    result: Dict[str, Any],
+    entries: Any,
+    high: float,
+    low: float,
+) -> None:
+    """Fill `result` from a decoded _PROBE_BATCH response array."""
+    if not isinstance(entries, list):
+        result["error"] = "invalid_batch_response"
+        return
+
+    by_id = {e["id"]: e.get("result") for e in entries if not e.get("error")}
+    chain_hex, block, gas_price_hex = by_id.get(0), by_id.get(1), by_id.get(2)
+    if chain_hex is None or block is None:
+        result["error"] = "partial_batch_response"
+        return
+
+    base_fee_hex = block.get("baseFeePerGas")
+    base_fee_gwei = int(base_fee_hex, 16) / 1e9 if base_fee_hex is not None else None
+    gas_price_gwei = (
+        int(gas_price_hex, 16) / 1e9 if gas_price_hex is not None else None
+    )
+
+    ratio = (
+        gas_price_gwei / base_fee_gwei
+        if base_fee_gwei not in (None, 0)
+        and gas_price_gwei is not None
+        else None
+    )
+
+    result.update(
+        {
+            "ok": True,
+            "chain_id": int(chain_hex, 16),
+            "block_number": int(block["number"], 16),
+            "base_fee_gwei": base_fee_gwei,
+            "gas_price_gwei": gas_price_gwei,
+            "ratio": ratio,
+            "status": classify_ratio(base_fee_gwei, gas_price_gwei, high, low),
+        }
+    )
+
+
+async def probe_rpc_async(
+    session: "aiohttp.ClientSession",
+    rpc_url: str,
+    high: float,
+    low: float,
+    timeout: float,
+) -> Dict[str, Any]:
+    """
+    Probe one RPC with a single batched JSON-RPC POST over the shared
+    aiohttp session. No web3 provider involved: gwei values come from
+    dividing the hex-decoded ints directly.
+    """
+    start = time.time()
+    result = _blank_result(rpc_url)
+
+    try:
+        async with session.post(
+            rpc_url,
+            json=_PROBE_BATCH,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as resp:
+            resp.raise_for_status()
+            entries = await resp.json()
+
+        _apply_probe_entries(result, entries, high, low)
+    except Exception as exc:  # noqa: BLE001
+        result["error"] = str(exc) or type(exc).__name__
+    finally:
+        result["elapsed_seconds"] = round(time.time() - start, 3)
+
+    return result
 
-        ratio = (
-            gas_price_gwei / base_fee_gwei
-            if base_fee_gwei not in (None, 0)
-            and gas_price_gwei is not None
-            else None
-        )
 
-        status = classify_ratio(base_fee_gwei, gas_price_gwei, high, low)
-
-        result.update(
-            {
-                "ok": True,
-                "chain_id": chain_id,
-                "block_number": block.number,
-                "base_fee_gwei": base_fee_gwei,
-                "gas_price_gwei": gas_price_gwei,
-                "ratio": ratio,
-                "status": status,
-            }
+async def probe_all_async(
+    rpcs: List[str],
+    high: float,
+    low: float,
+    timeout: float,
+) -> List[Dict[str, Any]]:
+    """Fan all probes out concurrently: wall time ~= slowest RPC, not the sum."""
+    async with aiohttp.ClientSession() as session:
+        return list(
+            await asyncio.gather(
+                *[probe_rpc_async(session, rpc, high, low, timeout) for rpc in rpcs]
+            )
         )
+
+
+def probe_rpc(
+    rpc_url: str,
+    high: float,
+    low: float,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> Dict[str, Any]:
+    """
+    Sync probe over the shared module session: one batched JSON-RPC
+    POST, no web3 provider (so no middleware/AttributeDict overhead and
+    no per-probe TLS handshake).
+    """
+    start = time.time()
+    result = _blank_result(rpc_url)
+
+    try:
+        resp = _SESSION.post(rpc_url, json=_PROBE_BATCH, timeout=timeout)
+        if resp.status_code != 200:
+            result["error"] = f"connection_failed (HTTP {resp.status_code})"
+            return result
+
+        _apply_probe_entries(result, resp.json(), high, low)
     except Exception as exc:  # noqa: BLE001
         result["error"] = str(exc) or type(exc).__name__
     finally:
@@ -255,13 +432,17 @@ def format_human_table(
             ]
         )
 
-    # Compute column widths
-    all_rows = [headers] + data_rows
-    col_widths = [max(len(str(col[i])) for col in all_rows) for i in range(len(headers))]
+    # Compute column widths in one pass — cells are already strings, so
+    # no per-column generator or re-stringify churn.
+    col_widths = [len(h) for h in headers]
+    for row in data_rows:
+        for i, cell in enumerate(row):
+            if len(cell) > col_widths[i]:
+                col_widths[i] = len(cell)
 
     def fmt_row(cols: List[str]) -> str:
         return "  ".join(
-            str(col).ljust(col_widths[i])
+            col.ljust(col_widths[i])
             for i, col in enumerate(cols)
         )
 
@@ -274,16 +455,29 @@ def main() -> None:
     args = parse_args()
     rpcs, names = resolve_rpcs_and_names(args)
 
-      results: List[Dict[str, Any]] = []
-    for rpc, name in zip(rpcs, names):
-        probe_result = probe_rpc(
-            rpc,
-            args.warn_ratio_high,
-            args.warn_ratio_low,
-            args.timeout,
+    # Probe all chains concurrently when aiohttp is available; the
+    # sequential raw-session path remains as the fallback.
+    if aiohttp is not None:
+        results = asyncio.run(
+            probe_all_async(
+                rpcs,
+                args.warn_ratio_high,
+                args.warn_ratio_low,
+                args.timeout,
+            )
         )
+    else:
+        results = [
+            probe_rpc(
+                rpc,
+                args.warn_ratio_high,
+                args.warn_ratio_low,
+                args.timeout,
+            )
+            for rpc in rpcs
+        ]
+    for name, probe_result in zip(names, results):
         probe_result["name"] = name
-        results.append(probe_result)
 
     # Sort by name for stable, readable output
     combined = sorted(zip(names, results), key=lambda pair: pair[0])
@@ -296,7 +490,7 @@ def main() -> None:
             "timestamp": timestamp,
             "multi_chain_gas_soundness": results,
         }
-        print(json.dumps(payload, indent=2, sort_keys=True))
+        emit_json(payload)
         sys.exit(0 if all(r["ok"] for r in results) else 2)
 
     # Human-readable mode
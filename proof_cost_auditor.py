@@ -22,7 +22,10 @@ import sys
 import time
 import json
 import argparse
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
 from web3 import Web3
 
 __version__ = "0.1.0"
@@ -40,12 +43,29 @@ NETWORKS = {
 }
 
 
+
+def emit_json(obj) -> None:
+    """Serialize with orjson when available (Rust encoder, ~5-10x faster
+    on large payloads), falling back to the stdlib encoder."""
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+    if orjson is not None:
+        sys.stdout.buffer.write(
+            orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS) + b"\n"
+        )
+        sys.stdout.buffer.flush()
+    else:
+        print(json.dumps(obj, indent=2, sort_keys=True))
+
+
 def network_name(cid: int) -> str:
     return NETWORKS.get(cid, f"Unknown (chain ID {cid})")
 
 def connect(rpc: str) -> Web3:
     w3 = Web3(Web3.HTTPProvider(rpc, request_kwargs={"timeout": 20}))
-       if not w3.is_connected():
+    if not w3.is_connected():
         print(f"❌ Failed to connect to RPC: {rpc}", file=sys.stderr)
         sys.exit(1)
     return w3
@@ -79,8 +99,9 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--file", required=True, help="File with one proof tx hash per line")
     p.add_argument("--tip-threshold", type=float, default=3.0, help="Tip Gwei threshold above network typical")
     p.add_argument("--gas-used-threshold", type=int, default=5_000_000, help="GasUsed threshold in units")
+    p.add_argument("--eth-price", type=float, help="ETH price in USD (optional)")
     p.add_argument("--json", action="store_true", help="Output JSON only")
-      p.add_argument(
+    p.add_argument(
         "--version",
         action="version",
         version=f"%(prog)s {__version__}",
@@ -88,6 +109,66 @@ def parse_args() -> argparse.Namespace:
     )
     return p.parse_args()
 
+
+def rpc_batch(
+    session: requests.Session,
+    rpc: str,
+    calls: List[Tuple[str, list]],
+    timeout: int = 20,
+) -> List[Optional[Any]]:
+    """
+    POST one JSON-RPC batch for `calls` (a list of (method, params)
+    tuples); return results in call order, None for sub-errors.
+    """
+    payload = [
+        {"jsonrpc": "2.0", "id": i, "method": m, "params": p}
+        for i, (m, p) in enumerate(calls)
+    ]
+    resp = session.post(rpc, json=payload, timeout=timeout)
+    resp.raise_for_status()
+    by_id = {e["id"]: e.get("result") for e in resp.json() if not e.get("error")}
+    return [by_id.get(i) for i in range(len(calls))]
+
+
+# Proof txs from one rollup batch frequently land in the same block, so
+# baseFeePerGas is memoized per block number — repeat lookups (and
+# repeat runs inside one process) skip the round-trip entirely.
+_block_cache: Dict[int, int] = {}
+
+
+def _build_result(
+    tx_hash: str,
+    block_number: int,
+    gas_used: int,
+    eff_price: int,
+    base_fee: int,
+    tip_threshold: float,
+    gas_used_threshold: int,
+) -> Dict[str, Any]:
+    """Pure cost/flag computation shared by the batched and per-tx paths."""
+    tip_per_gas = eff_price - base_fee
+
+    flags = []
+    # Constant scales instead of Web3.to_wei/from_wei: those route every
+    # value through decimal.Decimal, which is pure overhead here since
+    # the results are floats anyway.
+    if tip_per_gas > int(tip_threshold * 1e9):
+        flags.append("High tip")
+    if gas_used > gas_used_threshold:
+        flags.append("High gas used")
+
+    cost_eth = eff_price * gas_used * 1e-18
+    print(f"💰 Estimated cost of this proof tx: {round(cost_eth, 6)} ETH – flags: {flags or 'none'}")
+    return {
+        "txHash": tx_hash,
+        "blockNumber": block_number,
+        "gasUsed": gas_used,
+        "effectiveGasPriceGwei": eff_price * 1e-9,
+        "tipGwei": tip_per_gas * 1e-9,
+        "flags": flags,
+    }
+
+
 def audit_tx(
     w3: Web3,
     tx_hash: str,
@@ -103,70 +184,140 @@ def audit_tx(
     """
     rcpt = w3.eth.get_transaction_receipt(tx_hash)
     tx = w3.eth.get_transaction(tx_hash)
-    blk = w3.eth.get_block(int(rcpt.blockNumber))
-    base_fee = int(blk.get("baseFeePerGas", 0))
-       eff_from_rcpt = getattr(rcpt, "effectiveGasPrice", None)
+    bn = int(rcpt.blockNumber)
+    base_fee = _block_cache.get(bn)
+    if base_fee is None:
+        blk = w3.eth.get_block(bn)
+        base_fee = int(blk.get("baseFeePerGas", 0))
+        _block_cache[bn] = base_fee
+    eff_from_rcpt = getattr(rcpt, "effectiveGasPrice", None)
     eff_price = int(eff_from_rcpt if eff_from_rcpt is not None else tx.gasPrice)
-    tip_per_gas = eff_price - base_fee
-    gas_used = int(rcpt.gasUsed)
-flags = []
-if tip_per_gas > Web3.to_wei(tip_threshold, "gwei"):
-    flags.append("High tip")
-if gas_used > gas_used_threshold:
-    flags.append("High gas used")
-
-cost_eth = float(Web3.from_wei(eff_price * gas_used, "ether"))
-print(f"💰 Estimated cost of this proof tx: {round(cost_eth, 6)} ETH – flags: {flags or 'none'}")
-    return {
-        "txHash": tx_hash,
-        "blockNumber": int(rcpt.blockNumber),
-        "gasUsed": gas_used,
-        "effectiveGasPriceGwei": float(Web3.from_wei(eff_price, "gwei")),
-        "tipGwei": float(Web3.from_wei(tip_per_gas, "gwei")),
-                "flags": flags,
-    }
+    return _build_result(
+        tx_hash,
+        int(rcpt.blockNumber),
+        int(rcpt.gasUsed),
+        eff_price,
+        base_fee,
+        tip_threshold,
+        gas_used_threshold,
+    )
+
+
+def audit_all(
+    w3: Web3,
+    rpc: str,
+    hashes: List[str],
+    tip_threshold: float,
+    gas_used_threshold: int,
+) -> List[Dict[str, Any]]:
+    """
+    Audit all hashes in two batched JSON-RPC round-trips.
+
+    Phase 1 fetches every receipt in one POST; phase 2 fetches every
+    transaction plus each *unique* block (proof txs from one sequencer
+    batch frequently share a block) in a second POST. Falls back to the
+    per-tx web3 path over a thread pool if the endpoint rejects batches.
+    """
+    session = requests.Session()
+    try:
+        receipts = rpc_batch(
+            session,
+            rpc,
+            [("eth_getTransactionReceipt", [h]) for h in hashes],
+        )
+        if any(r is None for r in receipts):
+            raise ValueError("partial receipt batch")
+
+        block_numbers = [int(r["blockNumber"], 16) for r in receipts]
+        # Prefetch only blocks the cache has not seen yet.
+        unique_blocks = sorted(set(block_numbers) - _block_cache.keys())
+        phase2 = rpc_batch(
+            session,
+            rpc,
+            [("eth_getTransactionByHash", [h]) for h in hashes]
+            + [("eth_getBlockByNumber", [hex(n), False]) for n in unique_blocks],
+        )
+        txs = phase2[: len(hashes)]
+        fetched = 0
+        for n, blk in zip(unique_blocks, phase2[len(hashes):]):
+            if blk is not None:
+                _block_cache[n] = int(blk.get("baseFeePerGas") or "0x0", 16)
+                fetched += 1
+        if any(t is None for t in txs) or fetched < len(unique_blocks):
+            raise ValueError("partial tx/block batch")
+    except Exception as exc:
+        print(
+            f"⚠️  Batched audit failed ({exc}); falling back to per-tx requests.",
+            file=sys.stderr,
+        )
+        # Per-hash audits are independent IO: fan them out over threads.
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            return list(
+                pool.map(
+                    lambda h: audit_tx(w3, h, tip_threshold, gas_used_threshold),
+                    hashes,
+                )
+            )
+
+    results: List[Dict[str, Any]] = []
+    for h, rcpt, tx, bn in zip(hashes, receipts, txs, block_numbers):
+        eff_hex = rcpt.get("effectiveGasPrice")
+        eff_price = int(eff_hex if eff_hex is not None else tx["gasPrice"], 16)
+        results.append(
+            _build_result(
+                h,
+                bn,
+                int(rcpt["gasUsed"], 16),
+                eff_price,
+                _block_cache[bn],
+                tip_threshold,
+                gas_used_threshold,
+            )
+        )
+    return results
+
 
 def main():
     args = parse_args()
-  print(f"🐍 Python version: {sys.version.split()[0]}")
-print(f"🛠️ Audit thresholds → Tip > {args.tip_threshold} Gwei | GasUsed > {args.gas_used_threshold}")
+    print(f"🐍 Python version: {sys.version.split()[0]}")
+    print(f"🛠️ Audit thresholds → Tip > {args.tip_threshold} Gwei | GasUsed > {args.gas_used_threshold}")
 
     w3 = connect(args.rpc)
-  if w3.eth.chain_id != 1:
-    print(f"⚠️  Warning: You are connected to a test network (chainId {w3.eth.chain_id}). Results may differ from mainnet.")
+    if w3.eth.chain_id != 1:
+        print(f"⚠️  Warning: You are connected to a test network (chainId {w3.eth.chain_id}). Results may differ from mainnet.")
 
-  print(f"🕒 Audit initiated at {time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())} UTC")
+    print(f"🕒 Audit initiated at {time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())} UTC")
     hashes = read_tx_hashes(args.file)
-  print(f"🔍 Auditing {len(hashes)} proof transactions…")
-t0 = time.time()
-
-    results = [audit_tx(w3, h, args.tip_threshold, args.gas_used_threshold) for h in hashes]
-  total_cost_eth = round(sum(r["gasUsed"] * r["effectiveGasPriceGwei"] for r in results) / 1e9 / 1_000_000_000, 6)
-print(f"💲 Approximate total cost for all proofs: {total_cost_eth} ETH")
+    print(f"🔍 Auditing {len(hashes)} proof transactions…")
+    t0 = time.time()
 
+    results = audit_all(w3, args.rpc, hashes, args.tip_threshold, args.gas_used_threshold)
+    total_cost_eth = round(sum(r["gasUsed"] * r["effectiveGasPriceGwei"] for r in results) / 1e9, 6)
+    print(f"💲 Approximate total cost for all proofs: {total_cost_eth} ETH")
 
     if args.json:
-        print(json.dumps(results, indent=2, sort_keys=True))
-      return
-        if args.eth_price:
-    print(f"💵 Estimated USD cost: ${round(total_eth * args.eth_price, 2)}")
+        emit_json(results)
+        return
 
-    else:
-        print(f"🌐 {network_name(int(w3.eth.chain_id))} (chainId {w3.eth.chain_id})")
-        print(
-            "🔍 Proof cost audit results "
-            f"(tip threshold {args.tip_threshold} Gwei, "
-            f"gasUsed threshold {args.gas_used_threshold})"
-        )
+    print(f"🌐 {network_name(int(w3.eth.chain_id))} (chainId {w3.eth.chain_id})")
+    print(
+        "🔍 Proof cost audit results "
+        f"(tip threshold {args.tip_threshold} Gwei, "
+        f"gasUsed threshold {args.gas_used_threshold})"
+    )
+
+    for r in results:
+        flagstr = f"  🏷️ Flags: {','.join(r['flags'])}" if r.get("flags") else ""
+        print(f"- {r['txHash']} | block {r['blockNumber']} | gasUsed {r['gasUsed']} | tip {r['tipGwei']:.2f} Gwei{flagstr}")
+
+    if args.eth_price:
+        print(f"💵 Estimated USD cost: ${round(total_cost_eth * args.eth_price, 2)}")
+
+    print(f"✅ Audit completed in {round(time.time() - t0, 2)} seconds.")
 
-        for r in results:
-            flagstr = f"  🏷️ Flags: {','.join(r['flags'])}" if r.get("flags") else ""
-            print(f"- {r['txHash']} | block {r['blockNumber']} | gasUsed {r['gasUsed']} | tip {r['tipGwei']:.2f} Gwei{flagstr}")
-print(f"✅ Audit completed in {round(time.time() - t0, 2)} seconds.")
 if __name__ == "__main__":
     try:
         main()
     except KeyboardInterrupt:
         print("\n🛑 Audit aborted by user.", file=sys.stderr)
         sys.exit(1)
-
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+rpc_pool.py — Shared Web3 provider pool for the zk-gas-soundness CLIs.
+
+Cost dashboards typically run gas_cost_estimator and eip4844_blob_cost
+against the same endpoint; when an orchestrator imports both mains, a
+module-level pool here lets them share one Web3 instance — and thus one
+warm TCP/TLS connection set — instead of each paying its own handshake.
+
+Usage:
+  from rpc_pool import get_or_create_web3
+  w3 = get_or_create_web3(rpc)
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter, Retry
+from web3 import Web3
+
+try:
+    import httpx
+except ImportError:
+    httpx = None  # optional: falls back to the requests-session provider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # optional: stock web3 JSON decoding
+
+# One Web3 per (RPC URL, transport), guarded by a lock so concurrent
+# callers never race to build two providers for the same endpoint.
+_POOL = {}
+_LOCK = threading.Lock()
+
+# One httpx client for every HTTP/2 provider: multiplexing keeps many
+# in-flight JSON-RPC calls on a single TCP+TLS connection.
+_HTTPX_CLIENT = None
+
+
+def make_pooled_session() -> requests.Session:
+    """
+    Build a requests.Session with keep-alive pooling and a small retry
+    budget, so follow-up RPC calls reuse the warm TLS connection instead
+    of paying the handshake again (~100-300 ms on public RPCs). Retries
+    cover transient rate-limit/gateway statuses; pool_maxsize leaves
+    headroom for thread-pool fan-out over the same host.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.2,
+            status_forcelist=[429, 502, 503, 504],
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _get_httpx_client() -> "httpx.Client":
+    """Return the shared httpx client, preferring HTTP/2 (falls back to
+    HTTP/1.1 when the h2 extra is not installed)."""
+    global _HTTPX_CLIENT
+    if _HTTPX_CLIENT is None:
+        limits = httpx.Limits(max_connections=32, max_keepalive_connections=32)
+        timeout = httpx.Timeout(20.0, connect=3.0)
+        try:
+            _HTTPX_CLIENT = httpx.Client(http2=True, timeout=timeout, limits=limits)
+        except ImportError:
+            _HTTPX_CLIENT = httpx.Client(http2=False, timeout=timeout, limits=limits)
+    return _HTTPX_CLIENT
+
+
+class HTTP2Provider(Web3.HTTPProvider):
+    """
+    HTTPProvider that sends requests over a shared httpx client.
+
+    With HTTP/2, concurrent JSON-RPC calls multiplex over one TCP+TLS
+    connection instead of one socket (and handshake) each; encoding and
+    decoding reuse the stock provider implementation, so responses look
+    identical to web3.
+    """
+
+    def __init__(self, endpoint_uri: str, client: "httpx.Client"):
+        super().__init__(endpoint_uri)
+        self._client = client
+
+    def make_request(self, method, params):
+        request_data = self.encode_rpc_request(method, params)
+        resp = self._client.post(
+            self.endpoint_uri,
+            content=request_data,
+            headers={"Content-Type": "application/json"},
+        )
+        resp.raise_for_status()
+        return self.decode_rpc_response(resp.content)
+
+    def decode_rpc_response(self, raw_response):
+        # orjson parses large block responses ~3-5x faster than the
+        # stdlib decoder inside the stock provider; the result is the
+        # same plain response dict web3 expects.
+        if orjson is not None:
+            return orjson.loads(raw_response)
+        return super().decode_rpc_response(raw_response)
+
+
+def get_or_create_web3(rpc: str, poa: bool = False, http2: bool = True) -> Web3:
+    """
+    Return the pooled Web3 for `rpc`, creating it on first use.
+
+    Thread-safe. `poa=True` injects the geth PoA middleware at creation
+    (some L2/testnet chains need it). `http2=False` forces the
+    requests-session provider for endpoints that mis-implement HTTP/2;
+    otherwise the httpx/HTTP-2 transport is used when httpx is
+    installed. Raises ConnectionError when the endpoint is unreachable
+    so callers choose how to exit.
+    """
+    use_httpx = http2 and httpx is not None
+    key = (rpc, use_httpx)
+    w3 = _POOL.get(key)
+    if w3 is not None:
+        return w3
+    with _LOCK:
+        w3 = _POOL.get(key)
+        if w3 is not None:
+            return w3
+        if use_httpx:
+            provider = HTTP2Provider(rpc, _get_httpx_client())
+        else:
+            # Split connect/read timeouts: fail fast on unreachable hosts
+            # while still allowing slow responses to stream in.
+            provider = Web3.HTTPProvider(
+                rpc, session=make_pooled_session(), request_kwargs={"timeout": (3, 20)}
+            )
+        w3 = Web3(provider)
+        if not w3.is_connected():
+            raise ConnectionError(f"Failed to connect to RPC: {rpc}")
+        if poa:
+            try:
+                from web3.middleware import geth_poa_middleware
+                w3.middleware_onion.inject(geth_poa_middleware, layer=0)
+            except Exception:
+                pass
+        _POOL[key] = w3
+        return w3
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+smoke_compile.py — Fail fast if any CLI module stops parsing.
+
+Syntax/indentation regressions in the CLIs block everything downstream
+(py_compile, bytecode caching, the Numba AOT cache), so this check
+compiles every top-level module without importing it — no RPC deps
+needed. Wire it into CI or a pre-commit hook:
+
+  python scripts/smoke_compile.py
+"""
+
+import py_compile
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+MODULES = [
+    "app.py",
+    "blob_packing_planner.py",
+    "eip4844_blob_cost.py",
+    "estimator.py",
+    "gas_cost_estimator.py",
+    "gas_fee_profile.py",
+    "multi_chain_monitor.py",
+    "proof_cost_auditor.py",
+    "rpc_pool.py",
+    "scanner.py",
+    "utils_numba.py",
+]
+
+
+def main() -> int:
+    failed = 0
+    for name in MODULES:
+        path = REPO_ROOT / name
+        if not path.exists():
+            continue
+        try:
+            py_compile.compile(str(path), doraise=True)
+        except py_compile.PyCompileError as exc:
+            print(f"❌ {name}: {exc.msg}", file=sys.stderr)
+            failed += 1
+    if failed:
+        print(f"❌ {failed} module(s) failed to compile.", file=sys.stderr)
+        return 1
+    print("✅ All modules compile.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+utils_numba.py — JIT-compiled aggregation kernels for fee series.
+
+Companion to gas_fee_profile.py and scanner.py: the
+percentile/min/max/zero-count pass
+over tx-level fee arrays is a flat float loop with no Python objects,
+which is exactly what Numba compiles well. Importing this module
+requires numba + numpy; callers treat it as optional:
+
+  try:
+      from utils_numba import summary
+  except ImportError:
+      summary = None
+
+The kernels carry explicit signatures, so compilation happens eagerly
+at import rather than on first call, and `cache=True` persists the
+compiled artifacts on disk (.nbi/.nbc next to __pycache__) — the
+one-time JIT cost is paid once per machine, not once per run. Run
+scripts/precompile.py after install to prime the cache.
+"""
+
+import os
+
+import numpy as np
+from numba import njit, prange, set_num_threads
+
+
+def configure_threads(n=None):
+    """Pin the parallel kernels to `n` threads (default: all cores)."""
+    set_num_threads(n or os.cpu_count() or 1)
+
+
+@njit("f8(f8[:], i8)", cache=True)
+def _select_inplace(buf, k):
+    """
+    Return the k-th smallest element of `buf` (0-based), partially
+    partitioning it in place via iterative Hoare quickselect. O(n)
+    expected, and unlike repeated np.median it has no degenerate case
+    on near-uniform fee data.
+    """
+    left = 0
+    right = buf.shape[0] - 1
+    while left < right:
+        pivot = buf[(left + right) >> 1]
+        i = left
+        j = right
+        while i <= j:
+            while buf[i] < pivot:
+                i += 1
+            while buf[j] > pivot:
+                j -= 1
+            if i <= j:
+                tmp = buf[i]
+                buf[i] = buf[j]
+                buf[j] = tmp
+                i += 1
+                j -= 1
+        if k <= j:
+            right = j
+        elif k >= i:
+            left = i
+        else:
+            return buf[k]
+    return buf[k]
+
+
+@njit("f8(f8[:], f8)", cache=True)
+def _quantile_select(buf, q):
+    """Linear-interpolated quantile via quickselect (numpy's default
+    'linear' method, so results match np.percentile)."""
+    n = buf.shape[0]
+    pos = q * (n - 1)
+    lo = int(pos)
+    hi = lo + 1 if lo + 1 < n else lo
+    frac = pos - lo
+    v_lo = _select_inplace(buf, lo)
+    v_hi = _select_inplace(buf, hi) if hi != lo else v_lo
+    return v_lo * (1.0 - frac) + v_hi * frac
+
+
+@njit("Tuple((f8, f8, f8, f8, i8))(f8[:])", cache=True)
+def summary(arr):
+    """
+    Fused summary of a float64 fee array.
+
+    Returns (p50, p95, mn, mx, nzero): min/max/zero-count come from a
+    single fused loop, and both percentiles from quickselect over one
+    copied buffer — one allocation, no full sort, data stays cache-warm
+    between the passes.
+    """
+    n = arr.shape[0]
+    if n == 0:
+        return 0.0, 0.0, 0.0, 0.0, 0
+    mn = arr[0]
+    mx = arr[0]
+    nzero = 0
+    for i in range(n):
+        v = arr[i]
+        if v < mn:
+            mn = v
+        if v > mx:
+            mx = v
+        if v == 0.0:
+            nzero += 1
+    buf = arr.copy()
+    p50 = _quantile_select(buf, 0.50)
+    p95 = _quantile_select(buf, 0.95)
+    return p50, p95, mn, mx, nzero
+
+
+@njit("u1[:](f8[:], f8[:], f8[:], f8, f8, f8, f8)", cache=True)
+def flag_mask(tip, eff, fee, tip_th, eff_low, eff_high, fee_th):
+    """
+    Per-tx outlier bitmask for scanner.py.
+
+    Bits: 1 = high_tip, 2 = low_eff, 4 = high_eff, 8 = high_total_fee.
+    NaN in `eff` (unknown gas limit) matches neither efficiency flag,
+    mirroring the Python fallback. One flat pass, no Python objects —
+    the caller only materializes dicts for txs where the mask is
+    non-zero.
+    """
+    n = tip.shape[0]
+    out = np.empty(n, dtype=np.uint8)
+    for i in range(n):
+        m = 0
+        if tip[i] >= tip_th:
+            m |= 1
+        e = eff[i]
+        if e == e:
+            if e <= eff_low:
+                m |= 2
+            if e >= eff_high:
+                m |= 4
+        if fee[i] >= fee_th:
+            m |= 8
+        out[i] = m
+    return out
+
+
+@njit("u1[:](f8[:], f8[:], f8[:], f8, f8, f8, f8)", parallel=True, cache=True)
+def flag_mask_par(tip, eff, fee, tip_th, eff_low, eff_high, fee_th):
+    """
+    Parallel flag_mask: same bitmask, rows split across cores via
+    prange. Worth it only for large arrays (cached-receipt reruns and
+    whole-scan repasses); below a few thousand rows the thread fork
+    overhead dominates and the serial kernel wins. No fastmath — the
+    NaN self-compare that skips the efficiency flags needs IEEE
+    semantics.
+    """
+    n = tip.shape[0]
+    out = np.empty(n, dtype=np.uint8)
+    for i in prange(n):
+        m = 0
+        if tip[i] >= tip_th:
+            m |= 1
+        e = eff[i]
+        if e == e:
+            if e <= eff_low:
+                m |= 2
+            if e >= eff_high:
+                m |= 4
+        if fee[i] >= fee_th:
+            m |= 8
+        out[i] = m
+    return out